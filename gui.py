@@ -1,7 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
-from pathlib import Path
+import logging
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from suffle_capcu_track import shuffle_segments_between_marker_pairs
 import webbrowser
 
@@ -15,7 +19,20 @@ class CapCutShuffleGUI:
         self.project_folder = None
         self.projects = {}  # {folder_name: folder_path}
         self.project_vars = {}  # {folder_name: BooleanVar}
+        self.visible_names = []  # Folder names matching the current search, in display order
+        self._row_pool = []  # Fixed pool of Checkbuttons rebound to the visible slice
+        self._packed_rows = 0  # Number of pool widgets currently packed
+        self._row_height = None  # Pixel height of one checkbox row
+        self._viewport_rows = 1  # Rows that fit in the list area
+        self._first_row = 0  # Index into visible_names of the top row
         self.all_projects = {}  # Store all projects for searching
+        self._pending_filter = None  # after() id of the scheduled search refresh
+        self._last_matches = None  # frozenset of folder names currently shown
+        self._batch_queue = queue.Queue()  # Progress messages from the processing thread
+        self._batch_total = 0  # Number of projects in the running batch
+        self._processed_count = 0  # Projects in the running batch that succeeded
+        self._failed_projects = []  # "name: error" lines for projects that failed
+        self._scan_queue = None  # Results from the folder scan currently in progress
         
         # =====================================================================
         # STEP 1: Folder Selection Section
@@ -42,7 +59,7 @@ class CapCutShuffleGUI:
         tk.Label(search_frame, text="Search Projects:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
         
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', self.filter_projects)
+        self.search_var.trace('w', self._on_search_changed)
         
         search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=("Arial", 10))
         search_entry.pack(fill=tk.X, pady=5)
@@ -55,21 +72,17 @@ class CapCutShuffleGUI:
         
         tk.Label(project_frame, text="Select Projects to Process:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
         
-        # Scrollable frame with checkboxes
-        canvas = tk.Canvas(project_frame)
-        scrollbar = tk.Scrollbar(project_frame, orient="vertical", command=canvas.yview)
+        # Virtualized checkbox list: only the rows that fit in the viewport
+        # exist as widgets, and scrolling rebinds them to other projects
+        self.scrollbar = tk.Scrollbar(project_frame, orient="vertical", command=self._on_scrollbar)
         
-        self.checkbox_frame = tk.Frame(canvas)
-        self.checkbox_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=self.checkbox_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.checkbox_frame = tk.Frame(project_frame)
+        self.checkbox_frame.pack_propagate(False)  # Keep the list area at its allotted size
+        self.checkbox_frame.bind("<Configure>", self._on_list_configure)
+        self._bind_mousewheel(self.checkbox_frame)
         
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.checkbox_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=5)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # =====================================================================
         # STEP 4: Process Button
@@ -77,7 +90,7 @@ class CapCutShuffleGUI:
         button_frame = tk.Frame(root, padx=10, pady=10)
         button_frame.pack(fill=tk.X)
         
-        tk.Button(
+        self.process_button = tk.Button(
             button_frame,
             text="Process Selected Projects",
             command=self.process_projects,
@@ -86,7 +99,11 @@ class CapCutShuffleGUI:
             font=("Arial", 11, "bold"),
             width=30,
             height=2
-        ).pack(fill=tk.BOTH, expand=True)
+        )
+        self.process_button.pack(fill=tk.BOTH, expand=True)
+        
+        self.progress_label = tk.Label(button_frame, text="", fg="gray")
+        self.progress_label.pack(anchor=tk.W, pady=(5, 0))
         
         # =====================================================================
         # STEP 5: Footer
@@ -126,102 +143,279 @@ class CapCutShuffleGUI:
     
     def load_projects(self):
         """Load project folders from the selected master folder."""
-        # Clear previous checkboxes
-        for widget in self.checkbox_frame.winfo_children():
-            widget.destroy()
-        
+        # Clear previous checkboxes (the row widgets themselves are reused)
         self.projects = {}
         self.project_vars = {}
+        self.visible_names = []
+        self._render_rows()
         
         if not self.project_folder:
             messagebox.showwarning("No Folder", "Please select a folder first")
             return
         
+        self.all_projects = {}
+        self._last_matches = None
+        
+        # Scan on a background thread and add projects as they are found, so the
+        # window stays responsive on large or slow (network) master folders.
+        # Each scan gets its own queue; a superseded scan's queue is ignored.
+        self._scan_queue = queue.Queue()
+        threading.Thread(
+            target=self._scan_worker,
+            args=(self.project_folder, self._scan_queue),
+            daemon=True
+        ).start()
+        self.root.after(16, self._drain_scan, self._scan_queue)
+    
+    def _scan_worker(self, folder, scan_queue):
+        """Find project folders containing draft_content.json (runs on a background thread)."""
         try:
-            folder_path = Path(self.project_folder)
+            # DirEntry.is_dir() reuses the directory listing data instead of
+            # issuing another stat call per entry
+            with os.scandir(folder) as it:
+                entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
             
-            # Find all subdirectories that contain draft_content.json
-            for item in sorted(folder_path.iterdir()):
-                if item.is_dir():
-                    draft_json = item / "draft_content.json"
-                    if draft_json.exists():
-                        folder_name = item.name
-                        self.all_projects[folder_name] = str(item)
+            for entry in entries:
+                draft_json = os.path.join(entry.path, "draft_content.json")
+                if os.path.isfile(draft_json):
+                    scan_queue.put(("found", entry.name, entry.path))
+        except Exception as e:
+            scan_queue.put(("error", str(e)))
+        finally:
+            scan_queue.put(("done",))
+    
+    def _drain_scan(self, scan_queue):
+        """Add up to 50 scanned projects to the list, then reschedule until the scan is done."""
+        if scan_queue is not self._scan_queue:
+            return  # A newer folder selection replaced this scan
+        
+        finished = False
+        added = 0
+        while added < 50:
+            try:
+                message = scan_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            if not self.all_projects:
-                messagebox.showinfo("No Projects", "No CapCut project folders with draft_content.json found")
+            kind = message[0]
+            if kind == "found":
+                folder_name, folder_path = message[1], message[2]
+                self.all_projects[folder_name] = folder_path
+                # Selection state lives in the variables, not the row widgets
+                self.project_vars[folder_name] = tk.BooleanVar()
+                added += 1
+            elif kind == "error":
+                messagebox.showerror("Error", f"Failed to load projects: {message[1]}")
                 return
-            
-            # Display all projects initially
-            self.filter_projects()
+            elif kind == "done":
+                finished = True
+                break
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load projects: {str(e)}")
+        if added:
+            self.filter_projects(keep_scroll=True)
+        
+        if not finished:
+            self.root.after(16, self._drain_scan, scan_queue)
+        elif not self.all_projects:
+            messagebox.showinfo("No Projects", "No CapCut project folders with draft_content.json found")
+    
+    def _on_search_changed(self, *args):
+        """Debounce search input so a burst of keystrokes triggers one refresh."""
+        if self._pending_filter is not None:
+            self.root.after_cancel(self._pending_filter)
+        self._pending_filter = self.root.after(200, self.filter_projects)
     
-    def filter_projects(self, *args):
+    def filter_projects(self, *args, keep_scroll=False):
         """Filter projects based on search query."""
-        # Clear previous checkboxes
-        for widget in self.checkbox_frame.winfo_children():
-            widget.destroy()
-        
-        self.projects = {}
-        self.project_vars = {}
+        self._pending_filter = None
         
         search_query = self.search_var.get().lower()
+        matches = [name for name in self.all_projects if search_query in name.lower()]
         
-        # Filter projects based on search query
-        for folder_name, folder_path in self.all_projects.items():
-            if search_query in folder_name.lower():
-                self.projects[folder_name] = folder_path
-                
-                # Create checkbox variable and checkbox
-                var = tk.BooleanVar()
-                self.project_vars[folder_name] = var
-                
-                checkbox = tk.Checkbutton(
-                    self.checkbox_frame,
-                    text=folder_name,
-                    variable=var,
-                    font=("Arial", 10),
-                    anchor=tk.W
-                )
-                checkbox.pack(fill=tk.X, padx=5, pady=3)
+        # Nothing to rebuild if the query didn't change which projects are shown
+        match_set = frozenset(matches)
+        if match_set == self._last_matches:
+            return
+        self._last_matches = match_set
+        
+        self.projects = {name: self.all_projects[name] for name in matches}
+        self.visible_names = matches
+        if not keep_scroll:
+            self._first_row = 0
+        self._render_rows()
+    
+    def _bind_mousewheel(self, widget):
+        """Scroll the project list when the mouse wheel is used over widget."""
+        widget.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self._scroll_rows(-1))  # X11 wheel up
+        widget.bind("<Button-5>", lambda e: self._scroll_rows(1))  # X11 wheel down
+    
+    def _new_row(self):
+        """Create a pool Checkbutton; its text and variable are set when rendered."""
+        checkbox = tk.Checkbutton(
+            self.checkbox_frame,
+            font=("Arial", 10),
+            anchor=tk.W
+        )
+        self._bind_mousewheel(checkbox)
+        return checkbox
+    
+    def _on_list_configure(self, event):
+        """Resize the row pool to match the list area height."""
+        if self._row_height is None:
+            if not self._row_pool:
+                self._row_pool.append(self._new_row())
+            self._row_height = self._row_pool[0].winfo_reqheight() + 6  # pady=3 above and below
+        
+        self._viewport_rows = max(1, event.height // self._row_height)
+        
+        # One extra row covers a partially visible row at the bottom
+        while len(self._row_pool) < self._viewport_rows + 1:
+            self._row_pool.append(self._new_row())
+        
+        self._render_rows()
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags ("moveto") and arrow/trough clicks ("scroll")."""
+        if action == "moveto":
+            self._first_row = int(float(amount) * len(self.visible_names))
+            self._render_rows()
+        elif action == "scroll":
+            step = self._viewport_rows if unit == "pages" else 1
+            self._scroll_rows(int(amount) * step)
+    
+    def _scroll_rows(self, delta):
+        """Move the list by delta rows."""
+        self._first_row += delta
+        self._render_rows()
+    
+    def _render_rows(self):
+        """Bind the pool widgets to the visible slice of projects and update the scrollbar."""
+        total = len(self.visible_names)
+        max_first = max(0, total - self._viewport_rows)
+        self._first_row = min(max(self._first_row, 0), max_first)
+        
+        names = self.visible_names[self._first_row:self._first_row + len(self._row_pool)]
+        
+        for i, checkbox in enumerate(self._row_pool):
+            if i < len(names):
+                checkbox.config(text=names[i], variable=self.project_vars[names[i]])
+        
+        # Pool widgets are always packed as a prefix so pack order matches row order
+        for checkbox in self._row_pool[len(names):self._packed_rows]:
+            checkbox.pack_forget()
+        for checkbox in self._row_pool[self._packed_rows:len(names)]:
+            checkbox.pack(fill=tk.X, padx=5, pady=3)
+        self._packed_rows = len(names)
+        
+        if total:
+            self.scrollbar.set(
+                self._first_row / total,
+                min(1.0, (self._first_row + self._viewport_rows) / total)
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
     
     def process_projects(self):
         """Process all selected projects."""
+        # Ticks survive searches, so hidden projects that are ticked are processed too
         selected_projects = [name for name, var in self.project_vars.items() if var.get()]
         
         if not selected_projects:
             messagebox.showwarning("No Selection", "Please select at least one project")
             return
         
-        processed_count = 0
-        failed_projects = []
-        
-        for project_name in selected_projects:
-            try:
-                project_folder_path = self.projects[project_name]
+        paths = [self.all_projects[name] for name in selected_projects]
+        
+        self._batch_total = len(selected_projects)
+        self._processed_count = 0
+        self._failed_projects = []
+        
+        # Run the batch off the Tk main thread so the window stays responsive;
+        # the thread reports back through self._batch_queue, drained by _poll_batch
+        self.process_button.config(state=tk.DISABLED)
+        self.progress_label.config(text=f"Processing 0/{self._batch_total}...")
+        threading.Thread(
+            target=self._run_batch,
+            args=(selected_projects, paths),
+            daemon=True
+        ).start()
+        self.root.after(50, self._poll_batch)
+    
+    def _run_batch(self, selected_projects, paths):
+        """Shuffle the selected projects, in parallel worker processes when there are several (runs on a background thread)."""
+        try:
+            # Starting a process pool costs more than shuffling one project,
+            # so a single selection is handled right here on this thread
+            if len(paths) == 1:
+                try:
+                    shuffle_segments_between_marker_pairs(paths[0])
+                    self._batch_queue.put(("done", selected_projects[0]))
+                except Exception as e:
+                    self._batch_queue.put(("fail", selected_projects[0], str(e)))
+                return
+            
+            # Each project is an independent load/shuffle/save, so they can run in parallel.
+            # ProcessPoolExecutor rejects more than 61 workers on Windows.
+            max_workers = min(len(paths), os.cpu_count() or 1, 61)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(shuffle_segments_between_marker_pairs, path): name
+                    for name, path in zip(selected_projects, paths)
+                }
                 
-                # Run shuffle function with project folder path
-                # The function handles loading, processing, and syncing automatically
-                shuffle_segments_between_marker_pairs(project_folder_path)
-                processed_count += 1
+                for future in as_completed(futures):
+                    project_name = futures[future]
+                    try:
+                        future.result()
+                        self._batch_queue.put(("done", project_name))
+                    except Exception as e:
+                        self._batch_queue.put(("fail", project_name, str(e)))
+        except Exception as e:
+            self._batch_queue.put(("error", str(e)))
+        finally:
+            self._batch_queue.put(("finished",))
+    
+    def _poll_batch(self):
+        """Apply progress messages from the processing thread, then reschedule."""
+        while True:
+            try:
+                message = self._batch_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            except ValueError as e:
-                failed_projects.append(f"{project_name}: {str(e)}")
-            except Exception as e:
-                failed_projects.append(f"{project_name}: {str(e)}")
-        
-        # Show results
-        message = f"Processed: {processed_count} project(s)"
-        if failed_projects:
-            message += f"\n\nFailed:\n" + "\n".join(failed_projects)
+            kind = message[0]
+            if kind == "done":
+                self._processed_count += 1
+            elif kind == "fail":
+                self._failed_projects.append(f"{message[1]}: {message[2]}")
+            elif kind == "error":
+                self._failed_projects.append(f"Batch stopped: {message[1]}")
+            elif kind == "finished":
+                self._show_results()
+                return
+        
+        finished = self._processed_count + len(self._failed_projects)
+        self.progress_label.config(text=f"Processing {finished}/{self._batch_total}...")
+        self.root.after(50, self._poll_batch)
+    
+    def _show_results(self):
+        """Report the outcome of a processing batch."""
+        self.process_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="")
+        
+        message = f"Processed: {self._processed_count} project(s)"
+        if self._failed_projects:
+            message += f"\n\nFailed:\n" + "\n".join(self._failed_projects)
             messagebox.showinfo("Processing Complete", message)
         else:
             messagebox.showinfo("Success", message)
 
 
 if __name__ == "__main__":
+    # Required for the worker processes when bundled with PyInstaller on Windows
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.WARNING)
     root = tk.Tk()
     app = CapCutShuffleGUI(root)
     root.mainloop()
@@ -1,8 +1,86 @@
 import random
 import json
+import logging
 import os
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+# Ranges longer than this are permuted with numpy when it is installed.
+# numpy is imported lazily so projects without large ranges never load it.
+NUMPY_SHUFFLE_THRESHOLD = 64
+
+_numpy_rng = None  # numpy Generator, created on first use; False if numpy is missing
+
+
+def _reset_numpy_rng():
+    """Drop the cached Generator in a forked child so workers don't share its state."""
+    global _numpy_rng
+    if _numpy_rng:
+        _numpy_rng = None
+
+
+# Unlike the random module, numpy's Generator is not reseeded after fork
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_numpy_rng)
+
+log = logging.getLogger(__name__)
+
+
+def _write_atomic(path, data):
+    """
+    Write data to path via a temporary file in the same folder, so a crash
+    mid-write never leaves a truncated draft_content.json behind.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _shuffled(items):
+    """Return items in random order, permuting large lists with numpy when available."""
+    global _numpy_rng
+    if len(items) > NUMPY_SHUFFLE_THRESHOLD:
+        if _numpy_rng is None:
+            try:
+                import numpy as np
+            except ImportError:  # numpy is optional, random.shuffle is used without it
+                _numpy_rng = False
+            else:
+                # Seeding a Generator is costly, so one is reused for every call
+                _numpy_rng = np.random.default_rng()
+        if _numpy_rng:
+            permutation = _numpy_rng.permutation(len(items))
+            return [items[i] for i in permutation.tolist()]
+    items = list(items)
+    random.shuffle(items)
+    return items
+
+
+def _loads(data):
+    """Parse JSON text, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(project_data):
+    """Serialize project data to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(project_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(project_data, indent=2).encode('utf-8')
+
 
 def shuffle_segments_between_marker_pairs(project_path):
     """
@@ -24,40 +102,44 @@ def shuffle_segments_between_marker_pairs(project_path):
     RETURNS
     -------
     None
-        Modifies the project in-place and saves changes
+        Modifies the project in-place and saves changes. The file is left
+        untouched when no segment ends up at a different position.
     """
     
     # =========================================================================
     # STEP 1: Load the draft_content.json directly
     # =========================================================================
-    print("\n🔄 STEP 1: Loading draft_content.json...")
-    draft_json_path = os.path.join(project_path, "draft_content.json")
-    print(f"   Project path: {project_path}")
-    print(f"   Looking for: {draft_json_path}")
+    log.info("STEP 1: Loading draft_content.json...")
+    draft_json_path = Path(project_path) / "draft_content.json"
+    log.debug("Project path: %s", project_path)
+    log.debug("Looking for: %s", draft_json_path)
 
-    if not os.path.exists(draft_json_path):
+    if not draft_json_path.exists():
         raise ValueError("draft_content.json not found in project folder")
 
-    with open(draft_json_path, 'r', encoding='utf-8') as f:
-        project_data = json.load(f)
-    print("   ✓ Successfully loaded draft_content.json")
+    # Read and write the whole file as bytes in one go, skipping the text decoder
+    project_data = _loads(draft_json_path.read_bytes())
+    log.info("Successfully loaded draft_content.json")
     
     # =========================================================================
     # STEP 2: Process shuffling on the original structure
     # =========================================================================
-    print("\n🔄 STEP 2: Starting shuffling process...")
-    _shuffle_in_draft_format(project_data)
-    print("   ✓ Shuffling completed")
+    log.info("STEP 2: Starting shuffling process...")
+    dirty = _shuffle_in_draft_format(project_data)
+    log.info("Shuffling completed")
+    
+    if not dirty:
+        log.info("No segments were moved, leaving draft_content.json unchanged")
+        return
     
     # =========================================================================
     # STEP 3: Write back to the original file
     # =========================================================================
-    print("\n🔄 STEP 3: Writing changes back to draft_content.json...")
-    with open(draft_json_path, 'w', encoding='utf-8') as f:
-        json.dump(project_data, f, indent=2)
-    print("   ✓ Successfully saved changes")
+    log.info("STEP 3: Writing changes back to draft_content.json...")
+    _write_atomic(draft_json_path, _dumps(project_data))
+    log.info("Successfully saved changes")
     
-    print(f"\n✅ Successfully shuffled segments in: {project_path}\n")
+    log.info("Successfully shuffled segments in: %s", project_path)
 
 
 def _shuffle_in_draft_format(project_data):
@@ -66,21 +148,23 @@ def _shuffle_in_draft_format(project_data):
     
     This preserves all other project data (text layers, keyframes, transitions, etc.)
     while only shuffling the video segments between marker pairs.
+    
+    Returns True if any segment's start time was changed, False otherwise.
     """
     
     # =========================================================================
     # STEP 1: Extract markers and validate
     # =========================================================================
-    print("   [1.1] Extracting markers from time_marks...")
+    log.debug("[1.1] Extracting markers from time_marks...")
     time_marks_obj = project_data.get('time_marks', {})
     
     # Extract marker start times from mark_items
     mark_items = time_marks_obj.get('mark_items', []) if isinstance(time_marks_obj, dict) else []
-    print(f"       Found {len(mark_items)} marker items")
+    log.debug("Found %d marker items", len(mark_items))
     
     # Convert marker objects to just their start times (in milliseconds)
-    markers = sorted([m['time_range']['start'] for m in mark_items], reverse=True)
-    print(f"       Marker times (ms): {markers}")
+    markers = sorted(m['time_range']['start'] for m in mark_items)
+    log.debug("Marker times (ms): %s", markers)
     
     if len(markers) < 2:
         raise ValueError("Project must contain at least 2 markers")
@@ -88,81 +172,136 @@ def _shuffle_in_draft_format(project_data):
     # =========================================================================
     # STEP 2: Find the video tracks
     # =========================================================================
-    print("   [1.2] Finding video tracks...")
+    log.debug("[1.2] Finding video tracks...")
     tracks = project_data.get('tracks', [])
     if not tracks:
         raise ValueError("Project has no tracks")
-    print(f"       Total tracks found: {len(tracks)}")
+    log.debug("Total tracks found: %d", len(tracks))
+    
+    # Use the video track with the most segments (most likely the main content
+    # track), found in a single pass over the tracks
+    segments = None  # The target track doesn't change between marker pairs
+    video_track_count = 0
+    for track in tracks:
+        if track.get('type') != 'video':
+            continue
+        track_segments = track.get('segments')
+        if not track_segments:
+            continue
+        video_track_count += 1
+        if segments is None or len(track_segments) > len(segments):
+            segments = track_segments
     
-    # Find video tracks with segments
-    video_tracks = [t for t in tracks if t.get('type') == 'video' and t.get('segments')]
-    print(f"       Video tracks with segments: {len(video_tracks)}")
-    if not video_tracks:
+    log.debug("Video tracks with segments: %d", video_track_count)
+    if segments is None:
         raise ValueError("No video track with segments found")
+    log.debug("Selected track with %d segments", len(segments))
     
-    # Use the track with the most segments (most likely the main content track)
-    target_track = max(video_tracks, key=lambda t: len(t.get('segments', [])))
-    target_track_segment_count = len(target_track.get('segments', []))
-    print(f"       Selected track with {target_track_segment_count} segments")
+    # Order the segments by start time once so each marker pair can find its
+    # candidates with a binary search instead of scanning every segment.
+    # Segments without a complete timerange are left where they are, so
+    # everything past this point can index the keys directly.
+    timed = []  # [(start, index in segments)]
+    for i, seg in enumerate(segments):
+        timerange = seg.get('target_timerange')
+        if not timerange:
+            continue
+        seg_start = timerange.get('start')
+        if seg_start is None or timerange.get('duration') is None:
+            continue
+        timed.append((seg_start, i))
+    
+    # CapCut normally stores segments in timeline order, making the sort a no-op
+    in_timeline_order = all(a <= b for a, b in zip(timed, timed[1:]))
+    if not in_timeline_order:
+        timed.sort()
+    starts = [seg_start for seg_start, _ in timed]
     
     # =========================================================================
     # STEP 3: Process each pair of markers
     # =========================================================================
-    print(f"   [1.3] Processing {len(markers) // 2} marker pairs...")
+    dirty = False
+    placed = set()  # Indices rewritten by an earlier pair; their timed entries are stale
+    log.debug("[1.3] Processing %d marker pairs...", len(markers) // 2)
     
-    for pair_idx in range(0, len(markers) - 1, 2):
-        marker_start = markers[pair_idx + 1]  # Earlier marker
-        marker_end = markers[pair_idx]        # Later marker
-        
-        print(f"       Processing pair {pair_idx // 2 + 1}: {marker_start}ms - {marker_end}ms")
+    # Markers are paired from the latest one backwards, so with an odd count
+    # the earliest marker is the one left unpaired. The resulting pairs are
+    # disjoint (at most sharing a boundary marker) and processed in ascending
+    # order; the bisect windows and the `placed` skip below rely on that.
+    paired_markers = markers[len(markers) % 2:]
+    marker_pairs = zip(paired_markers[0::2], paired_markers[1::2])
+    
+    for pair_num, (marker_start, marker_end) in enumerate(marker_pairs, 1):
+        log.debug("Processing pair %d: %sms - %sms", pair_num, marker_start, marker_end)
         
         if marker_start >= marker_end:
-            print(f"           ⚠ Invalid pair (start >= end), skipping")
+            log.warning("Invalid pair %d (start >= end), skipping", pair_num)
             continue  # Skip invalid pairs
         
         # =====================================================================
         # STEP 4: Find segments within this marker pair range
         # =====================================================================
-        print(f"           [2.1] Finding segments in range...")
-        segments = target_track.get('segments', [])
-        segments_in_range = [
-            seg for seg in segments
-            if seg.get('target_timerange', {}).get('start', 0) >= marker_start 
-            and (seg.get('target_timerange', {}).get('start', 0) + seg.get('target_timerange', {}).get('duration', 0)) <= marker_end
-        ]
-        print(f"           [2.1] Found {len(segments_in_range)} segments in this range")
+        # Every segment starting inside the range is a candidate; keep the ones
+        # that also end inside it, along with their original index so the
+        # rebuild step doesn't need to search the main array again.
+        # Segments already placed by an earlier pair are skipped: their index
+        # now holds a different segment, and a zero-duration clip can sit on
+        # the boundary this pair shares with the previous one.
+        lo = bisect_left(starts, marker_start)
+        hi = bisect_right(starts, marker_end)
+        indexed = []
+        for seg_start, i in timed[lo:hi]:
+            if i in placed:
+                continue
+            seg = segments[i]
+            if seg_start + seg['target_timerange']['duration'] <= marker_end:
+                indexed.append((i, seg))
+        
+        # Keep array order matching timeline order when the rebuild scatters
+        # the shuffled segments back
+        if not in_timeline_order:
+            indexed.sort(key=lambda item: item[0])
+        log.debug("[2.1] Found %d segments in this range", len(indexed))
         
-        if not segments_in_range:
-            print(f"           ⚠ No segments in this range, skipping")
+        if not indexed:
+            log.debug("No segments in this range, skipping")
             continue  # No segments in this range
         
+        indices, segments_in_range = zip(*indexed)
+        placed.update(indices)
+        
         # =====================================================================
         # STEP 5: Shuffle segments in this range
         # =====================================================================
-        print(f"           [2.2] Shuffling {len(segments_in_range)} segments...")
-        random.shuffle(segments_in_range)
-        print(f"           [2.2] Shuffling complete")
+        log.debug("[2.2] Shuffling %d segments...", len(segments_in_range))
+        segments_in_range = _shuffled(segments_in_range)
         
         # =====================================================================
         # STEP 6: Rebuild timeline and reorder in array for this marker pair
         # =====================================================================
-        print(f"           [2.3] Rebuilding timeline...")
-        # Get the indices where these segments are located in the main array
-        segment_indices = [segments.index(seg) for seg in segments_in_range]
-        
-        # Put the shuffled segments back into their original index positions
-        for idx, seg in zip(sorted(segment_indices), segments_in_range):
-            segments[idx] = seg
+        log.debug("[2.3] Rebuilding timeline...")
+        # Put the shuffled segments back into their original index positions.
+        # Indices are ascending and unique, so when they span exactly as many
+        # positions as there are segments the block is contiguous and can be
+        # replaced with one slice assignment.
+        first_idx, last_idx = indices[0], indices[-1]
+        if last_idx - first_idx + 1 == len(indices):
+            segments[first_idx:last_idx + 1] = segments_in_range
+        else:
+            for idx, seg in zip(indices, segments_in_range):
+                segments[idx] = seg
         
-        print(f"           [2.3] Reordering segment start times...")
         # Update their start times in the new shuffled order
         cursor = marker_start
         
-        for seg_num, seg in enumerate(segments_in_range):
-            seg_duration = seg.get('target_timerange', {}).get('duration', 0)
-            old_start = seg['target_timerange'].get('start', 0)
-            seg['target_timerange']['start'] = cursor
-            print(f"               Segment {seg_num + 1}: {old_start}ms → {cursor}ms (duration: {seg_duration}ms)")
+        for seg in segments_in_range:
+            timerange = seg['target_timerange']
+            seg_duration = timerange['duration']
+            if timerange['start'] != cursor:
+                timerange['start'] = cursor
+                dirty = True
             cursor += seg_duration
         
-        print(f"           ✓ Pair {pair_idx // 2 + 1} completed\n")
\ No newline at end of file
+        log.debug("Pair %d completed (%d segments reordered)", pair_num, len(segments_in_range))
+    
+    return dirty
\ No newline at end of file
@@ -1,10 +1,14 @@
 import os
+import logging
 from suffle_capcu_track import shuffle_segments_between_marker_pairs
 
 # Replace this with your actual CapCut project folder path
 # For example: r"C:\CapCut Project\CapCut Drafts\TESTTS"
 project_path = r"C:\CapCut Project\CapCut Drafts\AmerimaTest"
 
+# Use logging.DEBUG to see per-marker-pair details
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 if not os.path.exists(project_path):
     print(f"❌ Project path not found: {project_path}")
 else:
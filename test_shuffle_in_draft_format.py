@@ -0,0 +1,93 @@
+import random
+import unittest
+from unittest import mock
+
+from suffle_capcu_track import _shuffle_in_draft_format
+
+
+def _reversed(items):
+    return list(reversed(items))
+
+
+def _project(markers, segments):
+    """Build a minimal draft with one video track; segments are (id, start, duration)."""
+    return {
+        'time_marks': {'mark_items': [{'time_range': {'start': m}} for m in markers]},
+        'tracks': [{
+            'type': 'video',
+            'segments': [
+                {'id': seg_id, 'target_timerange': {'start': start, 'duration': duration}}
+                for seg_id, start, duration in segments
+            ],
+        }],
+    }
+
+
+def _placement(project_data):
+    return [
+        (seg['id'], seg['target_timerange']['start'])
+        for seg in project_data['tracks'][0]['segments']
+    ]
+
+
+class ShuffleInDraftFormatTest(unittest.TestCase):
+
+    def test_zero_duration_clip_on_shared_marker_is_placed_once(self):
+        project = _project([0, 10, 10, 20], [('A', 0, 5), ('B', 5, 5), ('Z', 10, 0), ('C', 10, 5)])
+
+        with mock.patch('suffle_capcu_track._shuffled', _reversed):
+            self.assertTrue(_shuffle_in_draft_format(project))
+
+        # Z fits the first pair, so it is shuffled there and not picked up again
+        self.assertEqual(_placement(project), [('Z', 0), ('B', 0), ('A', 5), ('C', 10)])
+
+    def test_unchanged_project_is_not_dirty(self):
+        project = _project([0, 10], [('A', 0, 5)])
+
+        self.assertFalse(_shuffle_in_draft_format(project))
+        self.assertEqual(_placement(project), [('A', 0)])
+
+    def test_segments_out_of_array_order_are_scattered_back(self):
+        project = _project([0, 30], [('C', 20, 10), ('X', 40, 5), ('A', 0, 10), ('B', 10, 10)])
+
+        with mock.patch('suffle_capcu_track._shuffled', _reversed):
+            self.assertTrue(_shuffle_in_draft_format(project))
+
+        # Array positions 0, 2 and 3 are reused in timeline order; X is untouched
+        self.assertEqual(_placement(project), [('B', 0), ('X', 40), ('A', 10), ('C', 20)])
+
+    def test_segments_stay_within_their_marker_pair(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            # Short clips, frequent zero durations and duplicate markers
+            segments = []
+            cursor = 0
+            for i in range(rng.randint(1, 12)):
+                duration = rng.choice([0, 0, 1, 2, 3])
+                segments.append((i, cursor, duration))
+                cursor += duration
+            markers = [rng.randint(0, cursor) for _ in range(rng.randint(2, 6))]
+            if rng.random() < 0.5:
+                markers.append(rng.choice(markers))
+
+            project = _project(markers, segments)
+            ordered = sorted(markers)[len(markers) % 2:]
+            pairs = [(s, e) for s, e in zip(ordered[0::2], ordered[1::2]) if s < e]
+            durations = {seg_id: duration for seg_id, _, duration in segments}
+
+            def owning_pairs(start, duration):
+                return {p for p in pairs if p[0] <= start and start + duration <= p[1]}
+
+            before = {seg_id: owning_pairs(start, duration) for seg_id, start, duration in segments}
+
+            _shuffle_in_draft_format(project)
+
+            for seg_id, start in _placement(project):
+                if before[seg_id]:
+                    self.assertTrue(before[seg_id] & owning_pairs(start, durations[seg_id]))
+                else:
+                    self.assertEqual(start, segments[seg_id][1])
+
+
+if __name__ == "__main__":
+    unittest.main()